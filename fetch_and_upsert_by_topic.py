@@ -1,54 +1,87 @@
 import argparse
+import asyncio
+import atexit
+import functools
+import logging
 import os
-import json
-import time
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
 
-from dateutil import parser as date_parser
-from newspaper import Article
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-import supabase
-from postgrest.exceptions import APIError
+import requests
+from requests.adapters import HTTPAdapter
 
+# Heavy dependencies (playwright, selenium, newspaper, selectolax, httpx, supabase,
+# dateutil, orjson) are imported where they are used so that --help and
+# configuration errors return without loading them.
+if TYPE_CHECKING:
+    import httpx
+    from newspaper import Config
+    from postgrest.exceptions import APIError
+    from selenium import webdriver
 
-def save_topic_headlines_to_json(newstopics_topicid: str, json_file_basename: str) -> str:
+logger = logging.getLogger(__name__)
+
+
+def fetch_topic_headlines(newstopics_topicid: str) -> Dict[str, Any]:
     """
-    Fetch topic headlines from Google News and save the raw payload as JSON.
-    Returns the path to the saved JSON file.
+    Fetch topic headlines from Google News and return the raw payload.
     """
     from pygooglenews import GoogleNews
 
-    print(f"[1/5] Fetching Google News headlines for topic: {newstopics_topicid}")
+    logger.info("[1/5] Fetching Google News headlines for topic: %s", newstopics_topicid)
     gn = GoogleNews(lang='ar', country='SA')
-    news_results: Dict[str, Any] = gn.topic_headlines(newstopics_topicid)
+    return gn.topic_headlines(newstopics_topicid)
+
+
+def _json_default(value: Any) -> Any:
+    # feedparser stores dates as time.struct_time, which orjson does not serialize natively
+    if isinstance(value, tuple):
+        return list(value)
+    return str(value)
+
+
+def save_topic_headlines_to_json(news_results: Dict[str, Any], json_file_basename: str) -> str:
+    """
+    Save the raw headlines payload as compact JSON for debugging.
+    Returns the path to the saved JSON file.
+    """
+    import orjson
 
     json_file_path = f'{json_file_basename}.json'
-    with open(json_file_path, 'w', encoding='utf-8') as json_file:
-        json.dump(news_results, json_file, ensure_ascii=False, indent=4)
-    print(f"[2/5] Saved raw headlines JSON to: {json_file_path}")
+    with open(json_file_path, 'wb') as json_file:
+        json_file.write(orjson.dumps(news_results, default=_json_default))
+    logger.info("[2/5] Saved raw headlines JSON to: %s", json_file_path)
     return json_file_path
 
 
-def extract_values_from_json_file(file_path: str) -> List[Dict[str, Optional[str]]]:
-    print(f"[3/5] Extracting entries from: {file_path}")
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def _extract_entry(entry: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    source = entry.get('source')
+    return {
+        'link': entry.get('link'),
+        'source_href': source.get('href') if isinstance(source, dict) else None,
+        'source_title': source.get('title') if isinstance(source, dict) else None,
+    }
 
+
+def _extract_entries(raw_entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Optional[str]]]:
+    # Google News clusters often repeat a link; keep only its first occurrence
+    seen = set()
     extracted_data: List[Dict[str, Optional[str]]] = []
-    for entry in data.get('entries', []):
+    for entry in raw_entries:
         link = entry.get('link')
-        source_href = entry.get('source', {}).get('href') if isinstance(entry.get('source'), dict) else None
-        source_title = entry.get('source', {}).get('title') if isinstance(entry.get('source'), dict) else None
-        extracted_data.append({
-            'link': link,
-            'source_href': source_href,
-            'source_title': source_title,
-        })
-    print(f"[3/5] Extracted {len(extracted_data)} entries from JSON")
+        if not link or link in seen:
+            continue
+        seen.add(link)
+        extracted_data.append(_extract_entry(entry))
+    return extracted_data
+
+
+def extract_values_from_payload(data: Dict[str, Any]) -> List[Dict[str, Optional[str]]]:
+    logger.info("[3/5] Extracting entries from headlines payload")
+    extracted_data = _extract_entries(data.get('entries', []))
+    logger.info("[3/5] Extracted %s entries from payload", len(extracted_data))
     return extracted_data
 
 
@@ -61,26 +94,180 @@ def count_characters_and_check(string: Optional[str]) -> bool:
         return False
 
 
+# Body text below this is treated as a non-article page. Kept well under the 500-char
+# article_html gate, which counts markup, so that only clearly empty pages are dropped.
+MIN_BODY_TEXT_CHARS = 200
+
+
+def has_enough_body_text(html: Union[str, bytes]) -> bool:
+    """
+    Cheap heuristic pre-filter run before newspaper3k: reject pages whose whole <body>
+    has fewer than MIN_BODY_TEXT_CHARS characters of stripped text. This measures text
+    rather than markup, so it can still reject a borderline page that the later
+    article_html length check would have accepted.
+    """
+    from selectolax.parser import HTMLParser
+
+    try:
+        tree = HTMLParser(html)
+        body_len = len(tree.body.text(strip=True)) if tree.body else 0
+        return body_len >= MIN_BODY_TEXT_CHARS
+    except Exception:
+        # Let newspaper3k make the call on anything selectolax cannot handle
+        return True
+
+
+_PUNKT_LOCK = threading.Lock()
+
+
 def ensure_nltk_punkt() -> bool:
     """
     Ensure NLTK 'punkt' tokenizer is available for newspaper3k's NLP summary.
-    Returns True if available, False otherwise.
+    Returns True if available, False otherwise. The lookup runs once per process.
     """
+    with _PUNKT_LOCK:
+        return _find_or_download_punkt()
+
+
+@functools.lru_cache(maxsize=1)
+def _find_or_download_punkt() -> bool:
     try:
         import nltk
         try:
             nltk.data.find('tokenizers/punkt')
             return True
         except LookupError:
-            print("    - Downloading NLTK 'punkt' tokenizer...")
+            logger.info("    - Downloading NLTK 'punkt' tokenizer...")
             nltk.download('punkt', quiet=True)
             nltk.data.find('tokenizers/punkt')
             return True
     except Exception as e:
-        print(f"    - NLTK not available: {e}")
+        logger.warning("    - NLTK not available: %s", e)
         return False
 
 
+# WebDriver instances are not thread-safe, so each worker thread owns its own browser
+_THREAD_STATE = threading.local()
+_DRIVERS: List['webdriver.Chrome'] = []
+_DRIVERS_LOCK = threading.Lock()
+# Subresources the headless browser never needs to resolve a redirect
+BLOCKED_RESOURCE_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.css', '*.woff', '*.woff2', '*.ttf', '*.mp4', '*.webm',
+]
+# Playwright equivalent of BLOCKED_RESOURCE_PATTERNS
+BLOCKED_RESOURCE_TYPES = {'image', 'stylesheet', 'font', 'media'}
+# Pages open at once in the Playwright browser context
+BROWSER_MAX_PAGES = 4
+# Upper bound on how long to wait for the JavaScript redirect to leave Google News
+REDIRECT_TIMEOUT_SECONDS = 8
+# Number of entries resolved and parsed concurrently
+DEFAULT_MAX_WORKERS = 8
+HTTP_TIMEOUT_SECONDS = 10
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/124.0 Safari/537.36'
+)
+
+# Shared keep-alive session for plain HTTP redirect resolution
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.headers.update({'User-Agent': USER_AGENT})
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+_HTTP_SESSION.mount('http://', _HTTP_ADAPTER)
+_HTTP_SESSION.mount('https://', _HTTP_ADAPTER)
+
+# Total time budget for downloading one article, so slow sources cannot stall the batch
+ARTICLE_REQUEST_TIMEOUT_SECONDS = 8
+# Maximum simultaneous connections used when downloading article HTML
+ARTICLE_MAX_CONNECTIONS = 16
+
+
+@functools.lru_cache(maxsize=1)
+def _get_article_config() -> 'Config':
+    """
+    Return the shared newspaper3k configuration used by parse() and nlp(). Settings live
+    here rather than as Article kwargs, which newspaper3k would otherwise write back onto
+    the shared object. HTML is supplied via set_html(), so download settings do not apply.
+    """
+    from newspaper import Config
+
+    config = Config()
+    config.fetch_images = False
+    config.keep_article_html = True
+    return config
+
+
+_DRIVER_PATH_LOCK = threading.Lock()
+
+
+def _get_chromedriver_path() -> str:
+    """
+    Return the chromedriver path, resolving it once per process.
+    CHROMEDRIVER_PATH pins a local binary and skips webdriver-manager's version check entirely.
+    """
+    with _DRIVER_PATH_LOCK:
+        return _resolve_chromedriver_path()
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_chromedriver_path() -> str:
+    pinned = os.getenv('CHROMEDRIVER_PATH')
+    if pinned:
+        return pinned
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    return ChromeDriverManager().install()
+
+
+def _get_driver() -> 'webdriver.Chrome':
+    """
+    Return the calling thread's headless Chrome driver, starting it on first use.
+    Browsers are reused for every URL resolution on that thread and quit at interpreter exit.
+    """
+    driver = getattr(_THREAD_STATE, 'driver', None)
+    if driver is None:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
+        chrome_options = Options()
+        chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_argument('--disable-extensions')
+        chrome_options.add_argument('--disable-background-networking')
+        chrome_options.add_argument('--disable-sync')
+        chrome_options.add_argument('--disable-translate')
+        # Only the post-redirect URL is needed, so stop at DOMContentLoaded
+        chrome_options.page_load_strategy = 'eager'
+        logger.info("    - Starting headless Chrome")
+        driver = webdriver.Chrome(service=Service(_get_chromedriver_path()), options=chrome_options)
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCE_PATTERNS})
+        except Exception as e:
+            logger.warning("    - Could not enable resource blocking: %s", e)
+        _THREAD_STATE.driver = driver
+        with _DRIVERS_LOCK:
+            _DRIVERS.append(driver)
+    return driver
+
+
+def _quit_drivers() -> None:
+    with _DRIVERS_LOCK:
+        for driver in _DRIVERS:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        _DRIVERS.clear()
+
+
+atexit.register(_quit_drivers)
+
+
 def get_final_url_with_selenium(url: str) -> Optional[str]:
     """
     Follow redirects including JavaScript redirects to get the final URL.
@@ -91,166 +278,430 @@ def get_final_url_with_selenium(url: str) -> Optional[str]:
     Returns:
         Optional[str]: The final destination URL after all redirects
     """
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
 
     try:
-        print(f"    - Resolving final URL via headless Chrome")
-        driver = webdriver.Chrome(options=chrome_options)
+        logger.debug("    - Resolving final URL via headless Chrome")
+        driver = _get_driver()
         driver.get(url)
-        time.sleep(5)
+        try:
+            WebDriverWait(driver, REDIRECT_TIMEOUT_SECONDS).until(
+                lambda d: d.current_url != url and 'news.google.' not in d.current_url
+            )
+        except TimeoutException:
+            logger.warning("    - Redirect wait timed out; using current URL")
         final_url = driver.current_url
-        driver.quit()
-        print(f"    - Resolved URL: {final_url}")
+        logger.debug("    - Resolved URL: %s", final_url)
         return final_url
     except Exception as e:
         # Align with Optional[str] contract: return None on failure
-        print(f"    - URL resolution failed: {e}")
+        logger.warning("    - URL resolution failed: %s", e)
         return None
 
 
-def get_full_article(newsurl: str) -> Optional[Tuple[str, str, str, str, Any, str, str]]:
+def resolve_via_http(url: str) -> Optional[str]:
+    """
+    Follow plain HTTP redirects without a browser.
+    Tries HEAD first and retries with GET when the server rejects HEAD.
+    Returns the final URL, or None on failure.
     """
-    Resolve redirect, parse article with newspaper3k, and return details if the HTML length > 500 chars.
+    try:
+        response = _HTTP_SESSION.head(url, allow_redirects=True, timeout=HTTP_TIMEOUT_SECONDS)
+        if response.status_code >= 400:
+            response = _HTTP_SESSION.get(url, allow_redirects=True, timeout=HTTP_TIMEOUT_SECONDS)
+            response.close()
+        return response.url
+    except requests.RequestException as e:
+        logger.warning("    - HTTP redirect resolution failed: %s", e)
+        return None
+
+
+async def resolve_with_playwright(urls: List[str]) -> List[Optional[str]]:
+    """
+    Follow JavaScript redirects in one shared Playwright browser context.
+    Pages are opened concurrently, bounded by BROWSER_MAX_PAGES.
+    Results are returned in the same order as urls, with None for failures.
+    """
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    from playwright.async_api import async_playwright
+
+    semaphore = asyncio.Semaphore(BROWSER_MAX_PAGES)
+
+    async def block_subresources(route) -> None:
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def resolve(context, url: str) -> Optional[str]:
+        async with semaphore:
+            page = None
+            try:
+                page = await context.new_page()
+                await page.goto(url, wait_until='domcontentloaded')
+                try:
+                    await page.wait_for_url(
+                        lambda current: current != url and 'news.google.' not in current,
+                        timeout=REDIRECT_TIMEOUT_SECONDS * 1000,
+                        wait_until='commit',
+                    )
+                except PlaywrightTimeoutError:
+                    logger.warning("    - Redirect wait timed out; using current URL")
+                logger.debug("    - Resolved URL via Playwright: %s", page.url)
+                return page.url
+            except Exception as e:
+                logger.warning("    - URL resolution failed: %s", e)
+                return None
+            finally:
+                if page is not None:
+                    await page.close()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            context = await browser.new_context(user_agent=USER_AGENT)
+            await context.route('**/*', block_subresources)
+            return await asyncio.gather(*(resolve(context, url) for url in urls))
+        finally:
+            await browser.close()
+
+
+def resolve_with_browser(urls: List[str], executor: Optional[Executor] = None) -> List[Optional[str]]:
+    """
+    Follow JavaScript redirects with a headless browser.
+    Uses Playwright when it is installed and usable, and falls back to Selenium otherwise.
+    """
+    mapper = executor.map if executor else map
+    try:
+        import playwright  # noqa: F401
+    except ImportError:
+        return list(mapper(get_final_url_with_selenium, urls))
+    try:
+        return asyncio.run(resolve_with_playwright(urls))
+    except Exception as e:
+        # e.g. the package is installed but its browser is missing
+        logger.warning("    - Playwright unavailable (%s); falling back to Selenium", e)
+        return list(mapper(get_final_url_with_selenium, urls))
+
+
+def resolve_urls(links: List[str], executor: Optional[Executor] = None) -> List[str]:
+    """
+    Resolve Google News redirect links to publisher URLs, falling back to the original link.
+    Uses plain HTTP redirects and only launches a headless browser for links still on Google News.
+    """
+    mapper = executor.map if executor else map
+    resolved: List[Optional[str]] = list(mapper(resolve_via_http, links))
+    pending = [idx for idx, url in enumerate(resolved) if not url or 'news.google.' in url]
+    logger.info("    - Resolved %s/%s links via HTTP", len(links) - len(pending), len(links))
+    if pending:
+        browser_results = resolve_with_browser([links[idx] for idx in pending], executor)
+        for idx, url in zip(pending, browser_results):
+            resolved[idx] = url
+    return [url or link for url, link in zip(resolved, links)]
+
+
+async def fetch_html(
+    client: 'httpx.AsyncClient',
+    url: str,
+    semaphore: asyncio.Semaphore,
+) -> Optional[Union[str, bytes]]:
+    """
+    Download article HTML within ARTICLE_REQUEST_TIMEOUT_SECONDS, returning None on failure.
+    Returns raw bytes when the server does not declare a charset so newspaper3k can detect it.
+    """
+    import httpx
+
+    # The budget starts once a connection slot is free, so queued downloads are not penalised
+    async with semaphore:
+        try:
+            response = await asyncio.wait_for(client.get(url), ARTICLE_REQUEST_TIMEOUT_SECONDS)
+            response.raise_for_status()
+        except asyncio.TimeoutError:
+            logger.warning("    - Download timed out after %ss for %s", ARTICLE_REQUEST_TIMEOUT_SECONDS, url)
+            return None
+        except httpx.HTTPError as e:
+            logger.warning("    - Download failed for %s: %s", url, e)
+            return None
+    if 'charset' in response.headers.get('content-type', '').lower():
+        return response.text
+    return response.content
+
+
+async def fetch_all_html(urls: List[str]) -> List[Optional[Union[str, bytes]]]:
+    """
+    Download all article pages concurrently over one pooled HTTP/2 client.
+    Results are returned in the same order as urls.
+    """
+    import httpx
+
+    semaphore = asyncio.Semaphore(ARTICLE_MAX_CONNECTIONS)
+    async with httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=ARTICLE_MAX_CONNECTIONS),
+        timeout=httpx.Timeout(ARTICLE_REQUEST_TIMEOUT_SECONDS, pool=None),
+        follow_redirects=True,
+        headers={'User-Agent': USER_AGENT},
+    ) as client:
+        return await asyncio.gather(*(fetch_html(client, url, semaphore) for url in urls))
+
+
+def parse_article(final_url: str, html: Optional[Union[str, bytes]]) -> Optional[Tuple[str, str, str, str, Any, str, str]]:
+    """
+    Parse downloaded article HTML with newspaper3k and return details if the HTML length > 500 chars.
     Returns tuple: (title, article_html, text, top_image, publish_date, url, summary)
     """
-    # Resolve via provided JS-aware resolver, fall back to original URL
-    print(f"    - Fetching article for link: {newsurl}")
-    final_url = get_final_url_with_selenium(newsurl) or newsurl
+    from newspaper import Article
+
+    if not html:
+        return None
+    if not has_enough_body_text(html):
+        logger.info("    - Skipping article: page body too short")
+        return None
     try:
-        article = Article(url=final_url, fetch_images=True, keep_article_html=True)
-        article.download()
+        article = Article(url=final_url, config=_get_article_config())
+        article.set_html(html)
         article.parse()
+        # Reject short articles before paying for NLP summarization
+        if not count_characters_and_check(article.article_html):
+            logger.info("    - Skipping article: HTML too short")
+            return None
+
         news_summary = None
         if ensure_nltk_punkt():
             try:
                 article.nlp()
                 news_summary = getattr(article, 'summary', None)
             except Exception as e:
-                print(f"    - NLP summary generation failed: {e}")
+                logger.warning("    - NLP summary generation failed: %s", e)
 
         news_title = article.title
-        news_articlehtml = article.article_html
-        news_articletext = article.text
-        news_topimg = article.top_image
-        news_date = article.publish_date
-        news_url = article.url
-
-        if count_characters_and_check(news_articlehtml):
-            print(f"    - Parsed article: '{news_title[:60]}...' (HTML length ok)")
-            return (
-                news_title,
-                news_articlehtml,
-                news_articletext,
-                news_topimg,
-                news_date,
-                news_url,
-                news_summary,
-            )
-        print("    - Skipping article: HTML too short")
-        return None
+        logger.debug("    - Parsed article: '%s...' (HTML length ok)", news_title[:60])
+        return (
+            news_title,
+            article.article_html,
+            article.text,
+            article.top_image,
+            article.publish_date,
+            article.url,
+            news_summary,
+        )
     except Exception as e:
-        print(f"    - Failed to parse article: {e}")
+        logger.warning("    - Failed to parse article: %s", e)
         return None
 
 
-def convert_date_to_iso8601(given_date: Optional[str]) -> str:
+def convert_date_to_iso8601(given_date: Optional[Union[str, datetime]]) -> str:
+    # newspaper3k usually returns a datetime and feeds often carry ISO strings;
+    # only fall back to the much slower dateutil parser for anything else
+    if given_date is None:
+        return datetime.now(timezone.utc).isoformat()
+    if isinstance(given_date, datetime):
+        return given_date.isoformat()
+    try:
+        return datetime.fromisoformat(str(given_date)).isoformat()
+    except ValueError:
+        pass
+
+    from dateutil import parser as date_parser
+
     try:
-        if given_date is None:
-            return datetime.now().isoformat()
         return date_parser.parse(str(given_date)).isoformat()
     except Exception:
-        return datetime.now().isoformat()
+        return datetime.now(timezone.utc).isoformat()
 
 
 def create_supabase_client(project_url: str, api_key: str):
-    print(f"[4/5] Connecting to Supabase: {project_url}")
+    logger.info("[4/5] Connecting to Supabase: %s", project_url)
+    import supabase
+
     return supabase.create_client(project_url, api_key)
 
 
+# Maximum number of records sent to Supabase in a single upsert request
+MERGE_BATCH_LIMIT = 100
+NEWS_CONFLICT_COLUMN = 'news_url'
+
+
+def _api_error_code(e: 'APIError') -> Optional[str]:
+    try:
+        payload = e.args[0] if e.args else {}
+        return payload.get('code') if isinstance(payload, dict) else None
+    except Exception:
+        return None
+
+
+# Keeps the in_() filter, which travels in the query string, to a safe URL length
+EXISTING_URL_QUERY_CHUNK = 50
+
+
+def fetch_existing_news_urls(client, urls: List[str]) -> set:
+    """
+    Return the subset of urls already stored as news_url in the 'news' table.
+    On failure, returns whatever was collected so far and lets the upsert handle duplicates.
+    """
+    existing = set()
+    unique_urls = list(dict.fromkeys(urls))
+    try:
+        for start in range(0, len(unique_urls), EXISTING_URL_QUERY_CHUNK):
+            chunk = unique_urls[start:start + EXISTING_URL_QUERY_CHUNK]
+            response = client.table('news').select(NEWS_CONFLICT_COLUMN).in_(NEWS_CONFLICT_COLUMN, chunk).execute()
+            existing.update(row[NEWS_CONFLICT_COLUMN] for row in response.data or [])
+    except Exception as e:
+        logger.warning("    - Existing URL lookup failed: %s. Continuing without pre-filtering.", e)
+    return existing
+
+
 def upsert_article_record(client, data: dict) -> bool:
+    from postgrest.exceptions import APIError
+
     try:
-        client.table('news').upsert(data).execute()
-        print("    - Upserted article into 'news' table")
+        client.table('news').upsert(data, on_conflict=NEWS_CONFLICT_COLUMN).execute()
+        logger.info("    - Upserted article into 'news' table")
         return True
     except APIError as e:
         # Handle duplicate key or other PostgREST API errors gracefully
         msg = getattr(e, 'message', str(e))
-        try:
-            payload = e.args[0] if e.args else {}
-            code = payload.get('code') if isinstance(payload, dict) else None
-        except Exception:
-            code = None
-        if code == '23505' or 'duplicate key value' in str(e):
-            print("    - Duplicate detected (unique constraint). Skipping this article.")
+        if _api_error_code(e) == '23505' or 'duplicate key value' in str(e):
+            logger.info("    - Duplicate detected (unique constraint). Skipping this article.")
             return False
-        print(f"    - Upsert failed with API error: {msg}. Skipping this article.")
+        logger.warning("    - Upsert failed with API error: %s. Skipping this article.", msg)
         return False
     except Exception as e:
-        print(f"    - Upsert failed with unexpected error: {e}. Skipping this article.")
+        logger.warning("    - Upsert failed with unexpected error: %s. Skipping this article.", e)
         return False
 
 
+def upsert_article_records(client, records: List[dict]) -> int:
+    """
+    Upsert records into the 'news' table in a single request.
+    If the batch is rejected, retry row by row so one bad record does not drop the rest.
+    Returns the number of records upserted.
+    """
+    from postgrest.exceptions import APIError
+
+    if not records:
+        return 0
+    try:
+        client.table('news').upsert(records, on_conflict=NEWS_CONFLICT_COLUMN).execute()
+        logger.info("    - Upserted batch of %s articles into 'news' table", len(records))
+        return len(records)
+    except APIError as e:
+        msg = getattr(e, 'message', str(e))
+        logger.warning("    - Batch upsert failed (%s); retrying row by row", _api_error_code(e) or msg)
+    except Exception as e:
+        logger.warning("    - Batch upsert failed with unexpected error: %s; retrying row by row", e)
+    return sum(1 for record in records if upsert_article_record(client, record))
+
+
+def build_news_record(
+    entry: Dict[str, Optional[str]],
+    final_url: str,
+    html: Optional[Union[str, bytes]],
+    newstopics_topicid: str,
+) -> Optional[dict]:
+    """
+    Parse a downloaded entry into a 'news' record.
+    Returns None when the article could not be parsed or is too short.
+    """
+    source_href = entry.get('source_href')
+    source_title = entry.get('source_title')
+
+    details = parse_article(final_url, html)
+    if not details:
+        logger.info("    - Skipped: could not retrieve full article for %s", entry.get('link'))
+        return None
+
+    (
+        news_title,
+        news_articlehtml,
+        news_articletext,
+        news_topimg,
+        news_date,
+        news_url,
+        news_summary,
+    ) = details
+
+    normalized_date = convert_date_to_iso8601(news_date)
+
+    return {
+        'news_title': news_title,
+        'news_articlehtml': news_articlehtml,
+        'news_articletext': news_articletext,
+        'news_topimg': news_topimg,
+        'news_date': normalized_date,
+        'news_url': news_url,
+        'news_summary': news_summary,
+        'news_topicid': newstopics_topicid,
+        'news_source_href': source_href,
+        'news_source_title': source_title,
+        'news_source_logo': f"https://logo.clearbit.com/{source_href}" if source_href else None,
+    }
+
+
 def fetch_and_upsert_by_topic(
     supabase_url: str,
     supabase_key: str,
     newstopics_topicid: str,
     newstopics_title: str,
     limit: int = 10,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    debug_dump: bool = False,
 ) -> int:
-    json_path = save_topic_headlines_to_json(newstopics_topicid, newstopics_title)
-    entries = extract_values_from_json_file(json_path)
+    news_results = fetch_topic_headlines(newstopics_topicid)
+    if debug_dump:
+        save_topic_headlines_to_json(news_results, newstopics_title)
+    entries = extract_values_from_payload(news_results)
     client = create_supabase_client(supabase_url, supabase_key)
 
-    processed = 0
-    for idx, entry in enumerate(entries[:max(0, limit)], start=1):
-        print(f"[5/5] Processing entry {idx}/{min(len(entries), max(0, limit))}")
-        link = entry.get('link')
-        source_href = entry.get('source_href')
-        source_title = entry.get('source_title')
-        if not link:
-            print("    - Skipping entry: no link")
-            continue
-
-        details = get_full_article(link)
-        if not details:
-            print("    - Skipped: could not retrieve full article")
-            continue
+    selected = entries[:max(0, limit)]
+    workers = max(1, max_workers)
 
-        (
-            news_title,
-            news_articlehtml,
-            news_articletext,
-            news_topimg,
-            news_date,
-            news_url,
-            news_summary,
-        ) = details
-
-        normalized_date = convert_date_to_iso8601(news_date)
-
-        record = {
-            'news_title': news_title,
-            'news_articlehtml': news_articlehtml,
-            'news_articletext': news_articletext,
-            'news_topimg': news_topimg,
-            'news_date': normalized_date,
-            'news_url': news_url,
-            'news_summary': news_summary,
-            'news_topicid': newstopics_topicid,
-            'news_source_href': source_href,
-            'news_source_title': source_title,
-            'news_source_logo': f"https://logo.clearbit.com/{source_href}" if source_href else None,
+    processed = 0
+    pending: List[dict] = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        logger.info("[5/5] Resolving %s links with up to %s workers", len(selected), workers)
+        resolved_urls = resolve_urls([entry['link'] for entry in selected], executor)
+
+        # news_url holds the resolved publisher URL, so the lookup has to happen after resolution
+        skip_urls = fetch_existing_news_urls(client, resolved_urls)
+        if skip_urls:
+            logger.info("[5/5] Skipping %s articles already in 'news'", len(skip_urls))
+        queued_entries: List[Dict[str, Optional[str]]] = []
+        final_urls: List[str] = []
+        for entry, final_url in zip(selected, resolved_urls):
+            if final_url in skip_urls:
+                continue
+            # Distinct Google News links can resolve to the same article
+            skip_urls.add(final_url)
+            queued_entries.append(entry)
+            final_urls.append(final_url)
+
+        logger.info("[5/5] Downloading %s articles", len(final_urls))
+        htmls = asyncio.run(fetch_all_html(final_urls))
+
+        logger.info("[5/5] Parsing %s articles", len(final_urls))
+        futures = {
+            executor.submit(build_news_record, entry, final_url, html, newstopics_topicid): entry
+            for entry, final_url, html in zip(queued_entries, final_urls, htmls)
         }
-
-        if upsert_article_record(client, record):
-            processed += 1
-            print("    - Successfully upserted first article, stopping as requested.")
-            break
-
-    print(f"Completed. Total upserted articles: {processed}")
+        for done, future in enumerate(as_completed(futures), start=1):
+            logger.debug("[5/5] Finished entry %s/%s: %s", done, len(futures), futures[future].get('link'))
+            try:
+                record = future.result()
+            except Exception as e:
+                logger.warning("    - Entry processing failed with unexpected error: %s", e)
+                continue
+            if not record:
+                continue
+
+            pending.append(record)
+            if len(pending) >= MERGE_BATCH_LIMIT:
+                processed += upsert_article_records(client, pending)
+                pending = []
+
+    processed += upsert_article_records(client, pending)
+    logger.info("Completed. Total upserted articles: %s", processed)
     return processed
 
 
@@ -261,8 +712,10 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument('--supabase-url', required=False, help='Supabase project URL (or SUPABASE_URL env)')
     parser.add_argument('--supabase-key', required=False, help='Supabase service or anon key (or SUPABASE_KEY env)')
     parser.add_argument('--topic-id', required=False, default='CAAqIggKIhxDQkFTRHdvSkwyMHZNRFF5Y214bUVnSmhjaWdBUAE', help='Google News topic ID (default provided)')
-    parser.add_argument('--title', required=False, default='alhilal', help='Topic title; used for JSON filename (default: alhilal)')
+    parser.add_argument('--title', required=False, default='alhilal', help='Topic title; used for the --debug-dump JSON filename (default: alhilal)')
     parser.add_argument('--limit', type=int, default=50, help='Max number of entries to process (default: 50)')
+    parser.add_argument('--debug-dump', action='store_true', help='Also save the raw headlines payload to <title>.json')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS, help=f'Number of entries processed concurrently (default: {DEFAULT_MAX_WORKERS})')
     return parser.parse_args()
 
 
@@ -274,6 +727,15 @@ def main() -> None:
     except Exception:
         pass
 
+    log_level_name = os.getenv('LOG_LEVEL', 'INFO').upper()
+    # getLevelName maps known names to their numeric level and anything else to a string
+    log_level = logging.getLevelName(log_level_name)
+    logging.basicConfig(level=log_level if isinstance(log_level, int) else logging.INFO, format='%(message)s')
+    if not isinstance(log_level, int):
+        logger.warning("Unknown LOG_LEVEL %r; using INFO", log_level_name)
+    # httpx logs every request at INFO; keep the HTTP stack quiet unless something goes wrong
+    for noisy_logger in ('httpx', 'httpcore', 'hpack'):
+        logging.getLogger(noisy_logger).setLevel(logging.WARNING)
     args = parse_args()
 
     supabase_url = args.supabase_url or os.getenv('SUPABASE_URL')
@@ -296,15 +758,17 @@ def main() -> None:
             '\nProvide via CLI flags or environment variables (.env supported).'
         )
 
-    print("Starting fetch and upsert workflow...")
+    logger.info("Starting fetch and upsert workflow...")
     count = fetch_and_upsert_by_topic(
         supabase_url=supabase_url,
         supabase_key=supabase_key,
         newstopics_topicid=topic_id,
         newstopics_title=title,
         limit=limit,
+        max_workers=args.workers,
+        debug_dump=args.debug_dump,
     )
-    print("Done.")
+    logger.info("Done.")
     # Optionally, set exit code based on success for CI visibility
     if count == 0:
         raise SystemExit(1)